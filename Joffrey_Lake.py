@@ -3,35 +3,128 @@
 Multi-Park Monitor - Check Multiple BC Parks for 3 Days
 """
 
-import requests
-import json
+import asyncio
+import importlib.util
+import httpx
+import re
 import logging
-from datetime import datetime, timedelta
-import pytz
 import os
-from bs4 import BeautifulSoup
 import time
-from urllib.parse import urlencode
+from monitor_common import BaseMonitor
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO').upper(), format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
+logging.getLogger('httpx').setLevel(logging.WARNING)  # one INFO line per request is too noisy
 
-class MultiParkMonitor:
-    def __init__(self):
-        self.bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
-        self.chat_id = os.getenv('TELEGRAM_CHAT_ID')
-        self.base_url = "https://reserve.bcparks.ca"
-        self.timezone = pytz.timezone('America/Vancouver')
+# What a single page says about a park on a date, as read by the parser from its
+# visible text. UNAVAILABLE from a page for that date alone settles the date;
+# UNKNOWN (including pages that were never parsed) leaves it to the park's other URLs
+AVAILABLE = 'available'
+UNAVAILABLE = 'unavailable'
+UNKNOWN = 'unknown'
+
+# ETag/Last-Modified of pages that showed no availability, kept between runs
+ETAG_CACHE_FILE = '.park_etags.json'
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    # BeautifulSoup is several times slower, but still works if selectolax isn't installed
+    LexborHTMLParser = None
+    from bs4 import BeautifulSoup, SoupStrainer
+    
+    # Only build the parts of the page the availability parser looks at
+    STRAINER = SoupStrainer(['body', 'button', 'a', 'input', 'select', 'p', 'div', 'span', 'h1', 'h2', 'h3'])
+    
+    # lxml's C parser when it's there, otherwise the pure-Python one that ships with bs4
+    BS4_FEATURES = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
 
-        self.session = requests.Session()
-        self.session.headers.update({
+class Park:
+    """One monitored park, with its keyword matchers built once up front"""
+    
+    __slots__ = ('name', 'slug', 'keywords', 'priority', 'emoji',
+                 'kw_min', 'kw_bytes', 'kw_re', 'kw_bytes_re', 'url_templates')
+    
+    def __init__(self, name, slug, keywords, priority, emoji):
+        self.name = name
+        self.slug = slug
+        self.priority = priority
+        self.emoji = emoji
+        
+        # Page text is lowercased before matching, so keywords must be too. A keyword that
+        # contains another keyword can never decide a match on its own ('golden ears'
+        # implies 'golden'), so only the shortest non-redundant ones are scanned
+        self.keywords = [keyword.lower() for keyword in keywords]
+        self.kw_min = [
+            keyword for keyword in self.keywords
+            if not any(other != keyword and other in keyword for other in self.keywords)
+        ]
+        self.kw_bytes = [keyword.encode() for keyword in self.kw_min]
+        self.kw_re = re.compile('|'.join(map(re.escape, self.kw_min)))
+        self.kw_bytes_re = re.compile(b'|'.join(map(re.escape, self.kw_bytes)), re.IGNORECASE)
+        
+        # Filled in by the monitor, which knows the base URL
+        self.url_templates = []
+
+class RateLimiter:
+    """Async token bucket: up to `rate` requests per `period` seconds, shared by all tasks"""
+    
+    def __init__(self, rate, period=1.0):
+        self.rate = rate
+        self.period = period
+        self.tokens = rate
+        self.updated = None
+        self.lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a token is available, then take it"""
+        loop = asyncio.get_running_loop()
+        async with self.lock:
+            while True:
+                now = loop.time()
+                if self.updated is not None:
+                    self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate / self.period)
+                self.updated = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
+                await asyncio.sleep((1 - self.tokens) * self.period / self.rate)
+
+class MultiParkMonitor(BaseMonitor):
+    etag_cache_file = ETAG_CACHE_FILE
+    
+    def __init__(self, park_keys=None):
+        super().__init__()
+        self.base_url = "https://reserve.bcparks.ca"
+        
+        # Headers for BC Parks requests; the async client (see _create_client) manages
+        # keep-alive itself, and HTTP/2 forbids a Connection header. Accept-Encoding is
+        # left to httpx so it only asks for encodings it can decode (br needs brotli)
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1'
-        })
+        }
+        
+        # URLs are fetched concurrently over a shared HTTP/2 connection pool;
+        # transient gateway errors are retried instead of losing the URL for this run
+        self.max_connections = 16
+        self.max_retries = 2
+        self.retry_statuses = {502, 503, 504}
+        self.client = None
+        
+        # Politeness towards BC Parks: a token bucket shared by every concurrent request
+        self.requests_per_second = 5
+        self.limiter = None
+        
+        # Per-run cache of fetch tasks keyed by URL (see _get)
+        self._cache = {}
+        
+        # Formatted date strings keyed by ordinal day (see format_date_for_url)
+        self._date_cache = {}
         
         # Define parks to monitor
         self.parks = {
@@ -79,326 +172,405 @@ class MultiParkMonitor:
             }
         }
         
-        if not self.bot_token or not self.chat_id:
-            raise ValueError("Missing Telegram credentials")
+        # Optionally monitor a subset of parks (e.g. just 'joffre') with the same class
+        if park_keys:
+            unknown = set(park_keys) - set(self.parks)
+            if unknown:
+                raise ValueError(f"Unknown parks: {', '.join(sorted(unknown))}")
+            self.parks = {key: info for key, info in self.parks.items() if key in park_keys}
+        
+        self.parks = {key: Park(**info) for key, info in self.parks.items()}
+        
+        # URL templates per park; only the {date} placeholder changes between calls
+        for park_info in self.parks.values():
+            slug = park_info.slug
+            park_info.url_templates = [
+                # Main facility page
+                f"{self.base_url}/facility/{slug}",
+                
+                # Day use registration with date
+                f"{self.base_url}/dayuse/registration?facility={slug}&date={{date}}",
+                
+                # Alternative date parameter
+                f"{self.base_url}/dayuse/registration?facility={slug}&arrivalDate={{date}}",
+                
+                # General search
+                f"{self.base_url}/search?facility={slug}&date={{date}}&partySize=1",
+                
+                # Booking variations
+                f"{self.base_url}/booking/{slug}?date={{date}}"
+            ]
+        
+        # Enhanced availability indicators
+        self.availability_indicators = [
+            'available', 'book now', 'reserve now', 'select date', 
+            'choose date', 'select time', 'purchase', 'add to cart',
+            'book online', 'reservation available', 'make reservation',
+            'day use pass', 'day pass available', 'passes available',
+            'book this date', 'pass availability - low', 'reserve this date'
+        ]
+        
+        self.unavailable_indicators = [
+            'sold out', 'fully booked', 'no availability', 'unavailable',
+            'no passes available', 'booking closed', 'pass availability - full',
+            'waitlist only', 'no day use passes', 'passes sold out',
+            'date unavailable', 'not accepting reservations', 'fully reserved'
+        ]
+        
+        # Indicators are lowercase to match the page text. Each list is compiled into a
+        # single alternation (longest first so the most specific phrase is reported when
+        # several start at the same spot)
+        self._avail_re = re.compile('|'.join(map(re.escape, sorted(self.availability_indicators, key=len, reverse=True))))
+        self._unavail_re = re.compile('|'.join(map(re.escape, sorted(self.unavailable_indicators, key=len, reverse=True))))
+        
+        # Booking buttons/links whose text mentions one of these words, and date-like form fields.
+        # Both run on the raw response bytes
+        booking_words = ['book', 'pass availability - low', 'purchase', 'select', 'available']
+        self._button_re = re.compile(
+            rb'<(?:button|a)\b[^>]*>\s*[^<]{0,200}(?:' + b'|'.join(re.escape(word.encode()) for word in booking_words) + b')',
+            re.IGNORECASE
+        )
+        self._date_input_re = re.compile(
+            rb'<(?:input|select)\b[^>]*\bname\s*=\s*["\']?[^"\'\s>]*(?:date|arrival|visit)',
+            re.IGNORECASE
+        )
         
         # Test telegram connection on startup
         self.test_telegram_connection()
     
-    def get_target_dates(self):
-        """Get today, tomorrow, and day after tomorrow"""
-        now = datetime.now(self.timezone)
-        dates = {
-            'today': now,
-            'tomorrow': now + timedelta(days=1),
-            'day_after': now + timedelta(days=2)
-        }
-        return dates
-    
     def format_date_for_url(self, date_obj):
-        """Format date for different URL parameter formats"""
-        return {
+        """Format date for different URL parameter formats (cached per calendar day)"""
+        key = date_obj.toordinal()
+        cached = self._date_cache.get(key)
+        if cached:
+            return cached
+        
+        date_info = {
             'iso_date': date_obj.strftime('%Y-%m-%d'),
             'url_date': date_obj.strftime('%Y-%m-%d'),
             'display_date': date_obj.strftime('%B %d, %Y'),
             'short_date': date_obj.strftime('%m/%d/%Y'),
             'day_name': date_obj.strftime('%A')
         }
+        self._date_cache[key] = date_info
+        return date_info
     
-    def test_telegram_connection(self):
-        """Test if Telegram bot is working"""
-        try:
-            url = f"https://api.telegram.org/bot{self.bot_token}/getMe"
-            response = requests.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                bot_info = response.json()
-                logger.info(f"✅ Telegram bot connected: {bot_info['result']['username']}")
-                
-                target_dates = self.get_target_dates()
-                
-                test_message = f"🤖 <b>Multi-Park Monitor Started</b>\n\n"
-                test_message += f"📅 <b>Checking 3 Days:</b>\n"
-                test_message += f"   🔹 Today: {self.format_date_for_url(target_dates['today'])['display_date']} ({target_dates['today'].strftime('%A')})\n"
-                test_message += f"   🔹 Tomorrow: {self.format_date_for_url(target_dates['tomorrow'])['display_date']} ({target_dates['tomorrow'].strftime('%A')})\n"
-                test_message += f"   🔹 Day After: {self.format_date_for_url(target_dates['day_after'])['display_date']} ({target_dates['day_after'].strftime('%A')})\n\n"
-                
-                test_message += f"🏞️ <b>Monitoring {len(self.parks)} Parks:</b>\n"
-                sorted_parks = sorted(self.parks.items(), key=lambda x: x[1]['priority'])
-                for park_key, park_info in sorted_parks:
-                    test_message += f"   {park_info['emoji']} {park_info['name']}\n"
-                
-                test_message += f"\n🔍 <b>Status:</b> Bot is online and monitoring!"
-                
-                self.send_telegram(test_message)
-            else:
-                logger.error(f"❌ Telegram bot test failed: {response.status_code}")
-                
-        except Exception as e:
-            logger.error(f"❌ Telegram connection test error: {e}")
-    
-    def send_telegram(self, message):
-        try:
-            url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
-            payload = {
-                'chat_id': self.chat_id,
-                'text': message,
-                'parse_mode': 'HTML'
-            }
-            
-            response = requests.post(url, json=payload, timeout=10)
-            
-            if response.status_code == 200:
-                logger.info("✅ Telegram notification sent successfully")
-                return True
-            else:
-                logger.error(f"❌ Telegram API error: {response.status_code} - {response.text}")
-                return False
-                
-        except Exception as e:
-            logger.error(f"❌ Failed to send Telegram message: {e}")
-            return False
-    
-    def build_park_urls(self, park_info, target_date):
-        """Build URLs for a specific park and date"""
-        date_info = self.format_date_for_url(target_date)
-        slug = park_info['slug']
+    def build_startup_message(self):
+        """The message announcing a run, listing its dates and parks"""
+        target_dates = self.get_target_dates()
         
-        urls = [
-            # Main facility page
-            f"{self.base_url}/facility/{slug}",
-            
-            # Day use registration with date
-            f"{self.base_url}/dayuse/registration?facility={slug}&date={date_info['iso_date']}",
-            
-            # Alternative date parameter
-            f"{self.base_url}/dayuse/registration?facility={slug}&arrivalDate={date_info['iso_date']}",
-            
-            # General search
-            f"{self.base_url}/search?facility={slug}&date={date_info['iso_date']}&partySize=1",
-            
-            # Booking variations
-            f"{self.base_url}/booking/{slug}?date={date_info['iso_date']}"
+        parts = [
+            "🤖 <b>Multi-Park Monitor Started</b>\n\n",
+            "📅 <b>Checking 3 Days:</b>\n",
+            f"   🔹 Today: {self.format_date_for_url(target_dates['today'])['display_date']} ({target_dates['today'].strftime('%A')})\n",
+            f"   🔹 Tomorrow: {self.format_date_for_url(target_dates['tomorrow'])['display_date']} ({target_dates['tomorrow'].strftime('%A')})\n",
+            f"   🔹 Day After: {self.format_date_for_url(target_dates['day_after'])['display_date']} ({target_dates['day_after'].strftime('%A')})\n\n",
+            f"🏞️ <b>Monitoring {len(self.parks)} Parks:</b>\n"
         ]
         
-        return urls
+        sorted_parks = sorted(self.parks.values(), key=lambda x: x.priority)
+        parts.extend(f"   {park_info.emoji} {park_info.name}\n" for park_info in sorted_parks)
+        
+        parts.append("\n🔍 <b>Status:</b> Bot is online and monitoring!")
+        
+        return "".join(parts)
+    
+    def build_park_urls(self, park_info, target_date):
+        """Build URLs for a specific park and date"""
+        iso_date = self.format_date_for_url(target_date)['iso_date']
+        return [template.format(date=iso_date) for template in park_info.url_templates]
+    
+    def mentions_park(self, text, park_info):
+        """Check whether lowercased text mentions any of the park's keywords"""
+        return park_info.kw_re.search(text) is not None
     
-    def check_park_date_availability(self, park_key, park_info, target_date, day_label):
-        """Check availability for a specific park and date"""
-        date_info = self.format_date_for_url(target_date)
+    def _create_client(self):
+        """Create the HTTP/2 client shared by every BC Parks request in a run"""
+        limits = httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections)
+        return httpx.AsyncClient(
+            headers=self.headers,
+            timeout=15,
+            transport=httpx.AsyncHTTPTransport(http2=True, limits=limits, retries=self.max_retries)
+        )
+    
+    async def _fetch(self, url, park_info):
+        """Stream a URL, retrying transient gateway errors with a short backoff.
         
-        logger.info(f"\n{park_info['emoji']} {park_info['name']} - {day_label.upper()}")
-        logger.info(f"📅 {date_info['display_date']} ({date_info['day_name']})")
-        logger.info("-" * 60)
+        Returns (response, body). body is None when there is nothing to parse: the
+        request failed or the page never mentions the park. Any other page is read in
+        full and left to the parser, since only its visible text is a verdict.
+        """
+        keyword_re = park_info.kw_bytes_re
+        overlap = max(map(len, park_info.kw_bytes)) - 1
         
-        urls_to_check = self.build_park_urls(park_info, target_date)
-        availability_found = False
+        headers = self.conditional_headers(url)
         
-        for i, url in enumerate(urls_to_check, 1):
-            try:
-                logger.info(f"🔍 [{i}/{len(urls_to_check)}] Checking...")
-                response = self.session.get(url, timeout=15)
-                
-                if response.status_code == 200:
-                    logger.info(f"✅ Loaded ({len(response.text)} chars)")
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire()
+            async with self.client.stream('GET', url, headers=headers) as response:
+                retry = response.status_code in self.retry_statuses and attempt < self.max_retries
+                if not retry:
+                    if response.status_code != 200:
+                        return response, None
                     
-                    # Save debug content
-                    self.save_debug_content(response.text, f"{park_key}_{day_label}_{i}", url, target_date, park_key, day_label)
-                    
-                    if self.parse_for_park_availability(response.text, url, target_date, park_info, day_label):
-                        availability_found = True
-                        break
-                else:
-                    logger.warning(f"⚠️ HTTP {response.status_code}")
+                    chunks = []
+                    keyword_seen = False
+                    tail = b""
+                    async for chunk in response.aiter_bytes(65536):
+                        chunks.append(chunk)
+                        # Carry the end of the previous chunk so split matches are still found;
+                        # the pattern ignores case, so the window is never lowercased
+                        if not keyword_seen:
+                            keyword_seen = bool(keyword_re.search(tail + chunk))
+                            tail = chunk[-overlap:]
                     
-            except Exception as e:
-                logger.warning(f"⚠️ Error: {e}")
-                continue
+                    return response, b"".join(chunks) if keyword_seen else None
             
-            time.sleep(0.8)  # Be respectful
+            await asyncio.sleep(0.3 * 2 ** attempt)
+    
+    def _get(self, url, park_info):
+        """Fetch a URL at most once per run, sharing the pending request between callers"""
+        if url not in self._cache:
+            self._cache[url] = asyncio.ensure_future(self._fetch(url, park_info))
+        return self._cache[url]
+    
+    def check_park_url_response(self, response, body, url, url_index, park_key, park_info, target_date, day_label):
+        """Check one fetched URL for a specific park and date; returns AVAILABLE, UNAVAILABLE or UNKNOWN"""
+        prefix = f"{park_info.emoji} {park_info.name} - {day_label} [{url_index}]"
+        
+        if response.status_code == 304:
+            logger.info("♻️ %s Not modified since it showed no availability", prefix)
+            return UNKNOWN
         
-        result_emoji = "✅" if availability_found else "❌"
-        logger.info(f"{result_emoji} Result: {'AVAILABLE' if availability_found else 'NOT AVAILABLE'}")
+        if response.status_code != 200:
+            logger.warning("⚠️ %s HTTP %d", prefix, response.status_code)
+            return UNKNOWN
         
-        return availability_found
+        # _fetch already ruled out pages that don't mention the park
+        if body is None:
+            logger.info("✅ %s Loaded (park not mentioned)", prefix)
+            return UNKNOWN
+        
+        # The parser takes the bytes as they arrived; there's no str round trip
+        logger.info("✅ %s Loaded (%d bytes)", prefix, len(body))
+        
+        # Save debug content
+        self.save_debug_content(body, f"{park_key}_{day_label}_{url_index}", url, target_date, park_key, day_label)
+        
+        return self.parse_for_park_availability(body, url, target_date, park_info, day_label)
     
-    def check_all_parks_and_dates(self):
-        """Check all parks for all dates"""
+    async def check_all_parks_and_dates(self):
+        """Check all parks for all dates, fetching every URL concurrently"""
         try:
             target_dates = self.get_target_dates()
+            day_labels = {
+                'today': 'today',
+                'tomorrow': 'tomorrow', 
+                'day_after': 'day after tomorrow'
+            }
             results = {}
+            jobs = []
             
             # Sort parks by priority (Joffre first)
-            sorted_parks = sorted(self.parks.items(), key=lambda x: x[1]['priority'])
+            sorted_parks = sorted(self.parks.items(), key=lambda x: x[1].priority)
             
             for park_key, park_info in sorted_parks:
-                logger.info(f"\n{'='*80}")
-                logger.info(f"🏞️ CHECKING: {park_info['name'].upper()}")
-                logger.info(f"{'='*80}")
-                
                 park_results = {}
                 
                 for day_key, date_obj in target_dates.items():
-                    day_labels = {
-                        'today': 'today',
-                        'tomorrow': 'tomorrow', 
-                        'day_after': 'day after tomorrow'
-                    }
-                    
-                    day_label = day_labels[day_key]
-                    availability_found = self.check_park_date_availability(park_key, park_info, date_obj, day_label)
-                    
                     park_results[day_key] = {
                         'date': date_obj,
-                        'label': day_label,
-                        'available': availability_found
+                        'label': day_labels[day_key],
+                        'available': False,
+                        'settled': False
                     }
                     
-                    # Brief pause between dates
-                    time.sleep(1)
+                    for i, url in enumerate(self.build_park_urls(park_info, date_obj), 1):
+                        jobs.append((park_key, day_key, i, url))
                 
                 results[park_key] = {
                     'park_info': park_info,
                     'dates': park_results
                 }
+            
+            logger.info(f"🔍 Checking {len(jobs)} URLs across {len(results)} parks...")
+            
+            self.limiter = RateLimiter(self.requests_per_second)
+            async with self._create_client() as self.client:
+                # The same URL (e.g. the facility page) can appear for several dates;
+                # each unique URL is fetched once and its response routed to every job
+                tasks = {}
+                for job in jobs:
+                    tasks.setdefault(self._get(job[3], results[job[0]]['park_info']), []).append(job)
+                
+                logger.info(f"🔍 {len(tasks)} unique URLs to fetch")
+                await asyncio.gather(*tasks, return_exceptions=True)
+            
+            self._next_etag_cache = {}
+            for task, task_jobs in tasks.items():
+                # Only a page that was checked for every date and showed nothing is cached
+                cacheable = True
+                
+                # A page shared by several dates (the facility page has no date in it)
+                # can't say a particular date is unavailable
+                date_specific = len({job[:2] for job in task_jobs}) == 1
+                
+                for park_key, day_key, i, url in task_jobs:
+                    park_info = results[park_key]['park_info']
+                    date_result = results[park_key]['dates'][day_key]
+                    
+                    # One alert per park and date is enough, and a clear "unavailable"
+                    # from a page for that date means the rest needn't be parsed
+                    if date_result['settled']:
+                        cacheable = False
+                        continue
+                    
+                    try:
+                        response, body = task.result()
+                        verdict = self.check_park_url_response(response, body, url, i, park_key, park_info, date_result['date'], date_result['label'])
+                        if verdict == AVAILABLE:
+                            date_result['available'] = True
+                            cacheable = False
+                        date_result['settled'] = verdict == AVAILABLE or (verdict == UNAVAILABLE and date_specific)
+                    except Exception as e:
+                        cacheable = False
+                        logger.warning("⚠️ %s - %s [%d] Error: %s", park_info.name, date_result['label'], i, e)
                 
-                # Longer pause between parks
-                time.sleep(2)
+                if cacheable and response.status_code in (200, 304):
+                    self.remember_unavailable(url, response.status_code, response.headers)
             
+            self.save_etag_cache()
             return results
             
         except Exception as e:
             logger.error(f"❌ Multi-park check failed: {e}")
             return {}
     
-    def save_debug_content(self, html_content, filename_prefix, source_url, target_date, park_key, day_label):
-        """Save debug content for analysis"""
+    def save_debug_content(self, body, filename_prefix, source_url, target_date, park_key, day_label):
+        """Save the raw page for analysis (only when DEBUG_DUMP is set)"""
+        if not self.debug_dump:
+            return
+        
         try:
             timestamp = int(time.time())
             date_str = target_date.strftime('%Y%m%d')
             
-            # Save HTML
+            # Save the HTML bytes as received, behind a short header
             html_filename = f"debug_{filename_prefix}_{date_str}_{timestamp}.html"
-            with open(html_filename, 'w', encoding='utf-8') as f:
-                f.write(f"<!-- Park: {park_key} -->\n")
-                f.write(f"<!-- Day Label: {day_label} -->\n")
-                f.write(f"<!-- Target Date: {target_date.strftime('%Y-%m-%d %A')} -->\n")
-                f.write(f"<!-- Source URL: {source_url} -->\n")
-                f.write(f"<!-- Generated: {datetime.now()} -->\n\n")
-                f.write(html_content)
-            
-            logger.debug(f"💾 Saved: {html_filename}")
+            header = ''.join([
+                f"<!-- Park: {park_key} -->\n",
+                f"<!-- Day Label: {day_label} -->\n",
+                f"<!-- Target Date: {target_date.strftime('%Y-%m-%d %A')} -->\n",
+                f"<!-- Source URL: {source_url} -->\n",
+                f"<!-- Generated: {self._run_now_str} -->\n\n"
+            ])
+            with open(html_filename, 'wb') as f:
+                f.write(header.encode())
+                f.write(body)
+            
+            logger.debug("💾 Saved: %s", html_filename)
             
         except Exception as e:
             logger.error(f"❌ Failed to save debug content: {e}")
     
+    def extract_page_text(self, html_content):
+        """Return the visible body text of a page (scripts and styles excluded)"""
+        if LexborHTMLParser is None:
+            return BeautifulSoup(html_content, features=BS4_FEATURES, parse_only=STRAINER).get_text()
+        
+        tree = LexborHTMLParser(html_content)
+        tree.strip_tags(['script', 'style'])
+        return tree.body.text() if tree.body else ''
+    
     def parse_for_park_availability(self, html_content, source_url, target_date, park_info, day_label):
         try:
-            now = datetime.now(self.timezone)
-            soup = BeautifulSoup(html_content, 'html.parser')
-            page_text = soup.get_text().lower()
+            now = self._run_now
+            page_text = self.extract_page_text(html_content).lower()
             
             # Check for park content
-            has_park_content = any(keyword in page_text for keyword in park_info['keywords'])
+            has_park_content = self.mentions_park(page_text, park_info)
             
-            # Check for the specific date
+            # Check for the specific date (only reported in debug output)
             date_info = self.format_date_for_url(target_date)
-            date_keywords = [
-                date_info['iso_date'],
-                target_date.strftime('%B %d').lower(),
-                target_date.strftime('%b %d').lower(),
-                target_date.strftime('%m/%d')
-            ]
-            
-            has_target_date = any(date_keyword in page_text for date_keyword in date_keywords)
-            
-            logger.debug(f"   Park content: {has_park_content}, Target date: {has_target_date}")
+            if logger.isEnabledFor(logging.DEBUG):
+                date_keywords = [
+                    date_info['iso_date'],
+                    target_date.strftime('%B %d').lower(),
+                    target_date.strftime('%b %d').lower(),
+                    target_date.strftime('%m/%d')
+                ]
+                
+                has_target_date = any(date_keyword in page_text for date_keyword in date_keywords)
+                
+                logger.debug("   Park content: %s, Target date: %s", has_park_content, has_target_date)
             
             if not has_park_content:
-                return False
-            
-            # Enhanced availability indicators
-            availability_indicators = [
-                'available', 'book now', 'reserve now', 'select date', 
-                'choose date', 'select time', 'purchase', 'add to cart',
-                'book online', 'reservation available', 'make reservation',
-                'day use pass', 'day pass available', 'passes available',
-                'book this date', 'Pass availability - Low', 'reserve this date'
-            ]
+                return UNKNOWN
             
-            unavailable_indicators = [
-                'sold out', 'fully booked', 'no availability', 'unavailable',
-                'no passes available', 'booking closed', 'Pass availability - Full',
-                'waitlist only', 'no day use passes', 'passes sold out',
-                'date unavailable', 'not accepting reservations', 'fully reserved'
-            ]
-            
-            found_availability = [ind for ind in availability_indicators if ind in page_text]
-            found_unavailable = [ind for ind in unavailable_indicators if ind in page_text]
-            
-            # Look for interactive elements
-            booking_buttons = soup.find_all(['button', 'a'], string=lambda text: 
-                text and any(word in text.lower() for word in ['book', 'Pass availability - Low', 'purchase', 'select', 'available']))
-            
-            date_inputs = soup.find_all(['input', 'select'], attrs={
-                'name': lambda x: x and any(word in x.lower() for word in ['date', 'arrival', 'visit'])
-            })
+            # One pass over the page per indicator list, de-duplicated in page order
+            found_availability = list(dict.fromkeys(self._avail_re.findall(page_text)))
+            found_unavailable = list(dict.fromkeys(self._unavail_re.findall(page_text)))
             
-            has_interactive_elements = len(booking_buttons) > 0 or len(date_inputs) > 0
+            # Look for interactive elements straight in the HTML (no per-node Python callbacks)
+            has_interactive_elements = bool(self._button_re.search(html_content) or self._date_input_re.search(html_content))
             
-            logger.debug(f"   Availability: {found_availability}")
-            logger.debug(f"   Unavailable: {found_unavailable}")
-            logger.debug(f"   Interactive: {has_interactive_elements}")
+            logger.debug("   Availability: %s", found_availability)
+            logger.debug("   Unavailable: %s", found_unavailable)
+            logger.debug("   Interactive: %s", has_interactive_elements)
             
             # Decision logic
             has_availability_text = len(found_availability) > 0
             has_unavailable_text = len(found_unavailable) > 0
             
             if (has_availability_text or has_interactive_elements) and not has_unavailable_text:
-                logger.info(f"🎉 AVAILABILITY DETECTED!")
+                logger.info("🎉 AVAILABILITY DETECTED!")
                 
                 # Determine urgency level based on park priority
-                if park_info['priority'] == 1:  # Joffre Lakes
+                if park_info.priority == 1:  # Joffre Lakes
                     urgency = "⚡ URGENT: This is Joffre Lakes - spots disappear in minutes!"
                     action = "🏃‍♂️ Book immediately!"
-                elif park_info['priority'] <= 3:  # High priority parks
+                elif park_info.priority <= 3:  # High priority parks
                     urgency = "🔥 High Priority: Popular park - book soon!"
                     action = "🚀 Reserve now!"
                 else:
                     urgency = "📍 Good option available!"
                     action = "✅ Consider booking!"
                 
-                message = f"{park_info['emoji']} <b>{park_info['name'].upper()}</b> 🎉\n\n"
-                message += f"📅 <b>DATE:</b> {date_info['display_date']}\n"
-                message += f"🗓️ <b>Day:</b> {date_info['day_name']}\n"
-                message += f"⏰ <b>When:</b> {day_label.title()}\n\n"
-                message += f"🎫 <b>Status:</b> Availability detected\n"
-                message += f"🔗 <b>BOOK:</b> {source_url}\n\n"
+                parts = [
+                    f"{park_info.emoji} <b>{park_info.name.upper()}</b> 🎉\n\n",
+                    f"📅 <b>DATE:</b> {date_info['display_date']}\n",
+                    f"🗓️ <b>Day:</b> {date_info['day_name']}\n",
+                    f"⏰ <b>When:</b> {day_label.title()}\n\n",
+                    "🎫 <b>Status:</b> Availability detected\n",
+                    f"🔗 <b>BOOK:</b> {source_url}\n\n"
+                ]
                 
                 if found_availability:
-                    message += f"✅ <b>Indicators:</b> {', '.join(found_availability[:2])}\n"
+                    parts.append(f"✅ <b>Indicators:</b> {', '.join(found_availability[:2])}\n")
                 
-                message += f"\n{urgency}\n{action}\n\n"
-                message += f"🕐 <b>Found:</b> {now.strftime('%H:%M:%S')}"
+                parts.append(f"\n{urgency}\n{action}\n\n")
+                parts.append(f"🕐 <b>Found:</b> {now.strftime('%H:%M:%S')}")
                 
-                self.send_telegram(message)
-                return True
+                # Every fetch has finished by now, so queueing only waits for the
+                # remaining parses; the run's messages then go out in one post
+                self.queue_telegram("".join(parts))
+                return AVAILABLE
             
             elif has_unavailable_text:
-                logger.debug(f"❌ Unavailable")
-                return False
+                logger.debug("❌ Unavailable")
+                return UNAVAILABLE
             
             else:
-                logger.debug(f"❓ Status unclear")
-                return False
+                logger.debug("❓ Status unclear")
+                return UNKNOWN
                 
         except Exception as e:
             logger.error(f"❌ Parse error: {e}")
-            return False
+            return UNKNOWN
     
     def send_comprehensive_summary(self, results):
         """Send a comprehensive summary of all parks and dates"""
-        now = datetime.now(self.timezone)
+        now = self._run_now
         current_hour = now.hour
         
         # Send summary during reasonable hours
@@ -426,7 +598,7 @@ class MultiParkMonitor:
             else:
                 unavailable_parks.append(park_info)
         
-        # If we found availability, individual notifications were already sent
+        # If we found availability, its alerts are already queued for the run's post
         if available_spots:
             return
         
@@ -434,30 +606,34 @@ class MultiParkMonitor:
         if current_hour not in [7, 14, 21]:
             return
         
-        message = f"📊 <b>Multi-Park Monitor Summary</b>\n\n"
-        message += f"⏰ <b>Check Time:</b> {now.strftime('%Y-%m-%d %H:%M:%S')}\n"
-        message += f"🔍 <b>Parks Checked:</b> {len(self.parks)}\n"
-        message += f"📅 <b>Days Checked:</b> 3 (Today, Tomorrow, Day After)\n\n"
+        parts = [
+            "📊 <b>Multi-Park Monitor Summary</b>\n\n",
+            f"⏰ <b>Check Time:</b> {self._run_now_str}\n",
+            f"🔍 <b>Parks Checked:</b> {len(self.parks)}\n",
+            "📅 <b>Days Checked:</b> 3 (Today, Tomorrow, Day After)\n\n",
+            "❌ <b>No Availability Found:</b>\n"
+        ]
         
-        message += f"❌ <b>No Availability Found:</b>\n"
-        sorted_parks = sorted(unavailable_parks, key=lambda x: x['priority'])
-        for park_info in sorted_parks:
-            message += f"   {park_info['emoji']} {park_info['name']}\n"
+        sorted_parks = sorted(unavailable_parks, key=lambda x: x.priority)
+        parts.extend(f"   {park_info.emoji} {park_info.name}\n" for park_info in sorted_parks)
         
-        message += f"\n🔄 <b>Next Check:</b> Next scheduled run\n"
-        message += f"📱 You'll get instant alerts when spots appear!\n\n"
-        message += f"💡 <i>Monitoring continues automatically</i>"
+        parts.append("\n🔄 <b>Next Check:</b> Next scheduled run\n")
+        parts.append("📱 You'll get instant alerts when spots appear!\n\n")
+        parts.append("💡 <i>Monitoring continues automatically</i>")
         
-        self.send_telegram(message)
+        self.queue_telegram("".join(parts))
     
     def run_comprehensive_check(self):
-        start_time = datetime.now(self.timezone)
+        self.start_run_clock()
+        start_time = time.perf_counter()
         logger.info("=" * 100)
         logger.info("🚀 MULTI-PARK COMPREHENSIVE MONITOR - 3 DAY CHECK")
         logger.info("=" * 100)
         
+        self._cache = {}
+        
         try:
-            results = self.check_all_parks_and_dates()
+            results = asyncio.run(self.check_all_parks_and_dates())
             
             if results:
                 logger.info(f"\n📊 FINAL RESULTS SUMMARY:")
@@ -478,9 +654,9 @@ class MultiParkMonitor:
                             total_available += 1
                     
                     if available_dates:
-                        logger.info(f"✅ {park_info['emoji']} {park_info['name']}: {', '.join(available_dates)}")
+                        logger.info(f"✅ {park_info.emoji} {park_info.name}: {', '.join(available_dates)}")
                     else:
-                        logger.info(f"❌ {park_info['emoji']} {park_info['name']}: No availability")
+                        logger.info(f"❌ {park_info.emoji} {park_info.name}: No availability")
                 
                 logger.info(f"\n🎯 OVERALL SUMMARY:")
                 logger.info(f"   Available slots: {total_available}/{total_checked}")
@@ -492,21 +668,24 @@ class MultiParkMonitor:
             else:
                 logger.error("❌ No results obtained from checks")
             
-            duration = (datetime.now(self.timezone) - start_time).total_seconds()
+            duration = time.perf_counter() - start_time
             logger.info(f"\n⏱️ Total runtime: {duration:.2f} seconds")
             
         except Exception as e:
             logger.error(f"❌ Comprehensive check failed: {e}")
             
-            now = datetime.now(self.timezone)
+            now = self._run_now
             if 6 <= now.hour <= 23:
                 error_message = f"⚠️ <b>Multi-Park Monitor Error</b>\n\n"
                 error_message += f"❌ Failed during comprehensive check\n"
                 error_message += f"🐛 Error: {str(e)[:150]}\n"
-                error_message += f"⏰ Time: {now.strftime('%Y-%m-%d %H:%M:%S')}\n"
+                error_message += f"⏰ Time: {self._run_now_str}\n"
                 error_message += f"🔄 Will retry on next scheduled run"
                 
-                self.send_telegram(error_message)
+                self.queue_telegram(error_message)
+        
+        # Startup, availability, summary and error messages go out together in as few posts as possible
+        self.flush_telegram()
         
         logger.info("=" * 100)
         logger.info("✅ MULTI-PARK CHECK COMPLETED")
@@ -515,7 +694,9 @@ class MultiParkMonitor:
 def main():
     try:
         logger.info("🚀 Starting Multi-Park Monitor...")
-        monitor = MultiParkMonitor()
+        # MONITOR_PARKS=joffre,garibaldi limits the run to those parks
+        park_keys = [key.strip() for key in os.getenv('MONITOR_PARKS', '').split(',') if key.strip()]
+        monitor = MultiParkMonitor(park_keys)
         monitor.run_comprehensive_check()
         
     except Exception as e:
@@ -3,109 +3,149 @@
 Joffre Lakes Monitor - Check Today, Tomorrow, and Day After Tomorrow
 """
 
-import requests
-import json
+import asyncio
+import aiohttp
+import re
 import logging
-from datetime import datetime, timedelta
-import pytz
+from datetime import datetime
+from functools import lru_cache
 import os
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import time
-from urllib.parse import urlencode
+from urllib.parse import urlsplit
+from monitor_common import BaseMonitor
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class JoffreThreeDaysMonitor:
+# ETag/Last-Modified of pages that showed no availability, kept between runs
+ETAG_CACHE_FILE = '.joffre_etags.json'
+
+# Only build the parts of the page the availability parser looks at
+STRAINER = SoupStrainer(['body', 'button', 'a', 'input', 'select', 'p', 'div', 'span', 'h1', 'h2', 'h3'])
+
+# strftime patterns the target date may appear in on the page
+DATE_KEYWORD_FORMATS = ('%B %d', '%b %d', '%d %B', '%m/%d', '%-d')
+
+@lru_cache(maxsize=32)
+def _format_date(date_obj):
+    """Format a calendar date once for all the places that need it"""
+    iso_date = date_obj.strftime('%Y-%m-%d')
+    return {
+        'iso_date': iso_date,
+        'url_date': iso_date,
+        'display_date': date_obj.strftime('%B %d, %Y'),
+        'short_date': date_obj.strftime('%m/%d/%Y'),
+        'day_name': date_obj.strftime('%A'),
+        'keywords': (iso_date,) + tuple(date_obj.strftime(fmt).lower() for fmt in DATE_KEYWORD_FORMATS)
+    }
+
+@lru_cache(maxsize=8)
+def _date_regex(date_obj):
+    """One case-insensitive pattern matching any of a date's keywords"""
+    return re.compile('|'.join(map(re.escape, _format_date(date_obj)['keywords'])), re.IGNORECASE)
+
+class JoffreThreeDaysMonitor(BaseMonitor):
+    # Headers for BC Parks requests; aiohttp negotiates Accept-Encoding for the
+    # codecs it can decode and the connector handles keep-alive
+    _HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.5',
+        'Upgrade-Insecure-Requests': '1'
+    }
+    
+    # Enhanced availability indicators
+    _AVAILABILITY = (
+        'available', 'book now', 'reserve now', 'select date', 
+        'choose date', 'select time', 'purchase', 'add to cart',
+        'book online', 'reservation available', 'make reservation',
+        'day use pass', 'day pass available', 'passes available',
+        'book this date', 'available for booking', 'reserve this date'
+    )
+    
+    _UNAVAILABLE = (
+        'sold out', 'fully booked', 'no availability', 'unavailable',
+        'no passes available', 'booking closed', 'not available',
+        'waitlist only', 'no day use passes', 'passes sold out',
+        'date unavailable', 'not accepting reservations', 'fully reserved'
+    )
+    
+    _JOFFRE = ('joffre', 'joffrey')
+    
+    # Each keyword list compiled once into a single case-insensitive alternation (longest
+    # first so the most specific phrase is reported when several start at the same spot)
+    _AVAIL_RE = re.compile('|'.join(map(re.escape, sorted(_AVAILABILITY, key=len, reverse=True))), re.IGNORECASE)
+    _UNAVAIL_RE = re.compile('|'.join(map(re.escape, sorted(_UNAVAILABLE, key=len, reverse=True))), re.IGNORECASE)
+    _JOFFRE_RE = re.compile('|'.join(map(re.escape, _JOFFRE)), re.IGNORECASE)
+    
+    # Button/link text and form field names that suggest a booking form
+    _BTN_RE = re.compile(r'book|reserve|purchase|select|available', re.IGNORECASE)
+    _INPUT_NAME_RE = re.compile(r'date|arrival|visit', re.IGNORECASE)
+    
+    # Fixed parts of the Telegram messages
+    _AVAIL_HEADER = "🏔️ <b>JOFFRE LAKES AVAILABLE!</b> 🎉\n\n"
+    _AVAIL_URGENT = "\n⚡ <b>URGENT:</b> Joffre spots disappear in minutes!\n🏃‍♂️ <b>Book immediately!</b>\n\n"
+    _SUMMARY_HEADER = "📊 <b>Joffre Lakes Check Summary</b>\n\n"
+    _SUMMARY_FOOTER = "🔄 <b>Next check:</b> Next scheduled run\n\n📱 You'll get instant alerts when spots appear!"
+    
+    # Cheap check on the raw bytes before parsing ('joffrey' contains 'joffre')
+    _JOFFRE_BYTES_RE = re.compile(b'joffre', re.IGNORECASE)
+    
+    etag_cache_file = ETAG_CACHE_FILE
+    
     def __init__(self):
-        self.bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
-        self.chat_id = os.getenv('TELEGRAM_CHAT_ID')
+        super().__init__()
         self.base_url = "https://reserve.bcparks.ca"
-        self.timezone = pytz.timezone('America/Vancouver')
-
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        })
         
-        if not self.bot_token or not self.chat_id:
-            raise ValueError("Missing Telegram credentials")
+        # At most this many requests to BC Parks in flight at once
+        self.max_concurrent_requests = 5
+        self._semaphore = None
         
-        # Test telegram connection on startup
-        self.test_telegram_connection()
-    
-    def get_target_dates(self):
-        """Get today, tomorrow, and day after tomorrow"""
-        now = datetime.now(self.timezone)
-        dates = {
-            'today': now,
-            'tomorrow': now + timedelta(days=1),
-            'day_after': now + timedelta(days=2)
-        }
-        return dates
+        # Minimum spacing between requests to the same host, tracked per host
+        self.min_request_gap = 1.5
+        self._last_hit = {}
+        self._host_locks = {}
+        
+        # Rate limiting and transient server errors are retried, honouring Retry-After
+        # up to a cap, instead of losing the URL for this run
+        self.max_retries = 2
+        self.retry_statuses = {429, 500, 502, 503, 504}
+        self.retry_backoff = 0.5
+        self.max_retry_after = 30
+        
+        # URLs for each target date, built once per run
+        self._urls_by_day = {}
+        
+        # Debug dumps (DEBUG_DUMP) are written off the event loop
+        self._debug_writes = []
+        
+        # Availability alerts are sent together at the end of the run; JOFFRE_URGENT
+        # pushes the first one out as soon as it's found
+        self.urgent_first_hit = bool(os.getenv('JOFFRE_URGENT'))
+        self._urgent_task = None
     
     def format_date_for_url(self, date_obj):
         """Format date for different URL parameter formats"""
-        return {
-            'iso_date': date_obj.strftime('%Y-%m-%d'),
-            'url_date': date_obj.strftime('%Y-%m-%d'),
-            'display_date': date_obj.strftime('%B %d, %Y'),
-            'short_date': date_obj.strftime('%m/%d/%Y'),
-            'day_name': date_obj.strftime('%A')
-        }
+        return _format_date(date_obj.date())
     
-    def test_telegram_connection(self):
-        """Test if Telegram bot is working"""
-        try:
-            url = f"https://api.telegram.org/bot{self.bot_token}/getMe"
-            response = requests.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                bot_info = response.json()
-                logger.info(f"✅ Telegram bot connected: {bot_info['result']['username']}")
-                
-                target_dates = self.get_target_dates()
-                
-                test_message = f"🤖 <b>Joffre Lakes Monitor Started</b>\n\n"
-                test_message += f"📅 <b>Checking 3 Days:</b>\n"
-                test_message += f"   🔹 Today: {self.format_date_for_url(target_dates['today'])['display_date']} ({target_dates['today'].strftime('%A')})\n"
-                test_message += f"   🔹 Tomorrow: {self.format_date_for_url(target_dates['tomorrow'])['display_date']} ({target_dates['tomorrow'].strftime('%A')})\n"
-                test_message += f"   🔹 Day After: {self.format_date_for_url(target_dates['day_after'])['display_date']} ({target_dates['day_after'].strftime('%A')})\n\n"
-                test_message += f"🔍 <b>Status:</b> Bot is online and monitoring!"
-                
-                self.send_telegram(test_message)
-            else:
-                logger.error(f"❌ Telegram bot test failed: {response.status_code}")
-                
-        except Exception as e:
-            logger.error(f"❌ Telegram connection test error: {e}")
+    def build_startup_message(self):
+        """The message announcing a run, listing its dates"""
+        target_dates = self.get_target_dates()
+        
+        test_message = f"🤖 <b>Joffre Lakes Monitor Started</b>\n\n"
+        test_message += f"📅 <b>Checking 3 Days:</b>\n"
+        test_message += f"   🔹 Today: {self.format_date_for_url(target_dates['today'])['display_date']} ({target_dates['today'].strftime('%A')})\n"
+        test_message += f"   🔹 Tomorrow: {self.format_date_for_url(target_dates['tomorrow'])['display_date']} ({target_dates['tomorrow'].strftime('%A')})\n"
+        test_message += f"   🔹 Day After: {self.format_date_for_url(target_dates['day_after'])['display_date']} ({target_dates['day_after'].strftime('%A')})\n\n"
+        test_message += f"🔍 <b>Status:</b> Bot is online and monitoring!"
+        
+        return test_message
     
-    def send_telegram(self, message):
-        try:
-            url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
-            payload = {
-                'chat_id': self.chat_id,
-                'text': message,
-                'parse_mode': 'HTML'
-            }
-            
-            response = requests.post(url, json=payload, timeout=10)
-            
-            if response.status_code == 200:
-                logger.info("✅ Telegram notification sent successfully")
-                return True
-            else:
-                logger.error(f"❌ Telegram API error: {response.status_code} - {response.text}")
-                return False
-                
-        except Exception as e:
-            logger.error(f"❌ Failed to send Telegram message: {e}")
-            return False
+    def send_or_queue_telegram(self, message):
+        """Send a message now, falling back to the next flush_telegram if that fails"""
+        if not self.send_telegram(message):
+            self.queue_telegram(message)
     
     def build_joffre_urls(self, target_date, day_label):
         """Build URLs with date parameters for Joffre Lakes"""
@@ -134,69 +174,138 @@ class JoffreThreeDaysMonitor:
         
         return urls
     
-    def check_single_date_availability(self, target_date, day_label):
-        """Check availability for a single date"""
+    async def _respect_delay(self, host, min_gap):
+        """Wait until at least min_gap seconds have passed since the last request to host"""
+        # One waiter per host at a time; cancelled waiters simply drop out of the queue
+        async with self._host_locks.setdefault(host, asyncio.Lock()):
+            loop = asyncio.get_running_loop()
+            wait = min_gap - (loop.time() - self._last_hit.get(host, float('-inf')))
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._last_hit[host] = loop.time()
+    
+    async def _fetch(self, session, url, headers=None):
+        """Fetch a URL, returning its status code, raw body bytes and response headers"""
+        for attempt in range(self.max_retries + 1):
+            async with self._semaphore:
+                await self._respect_delay(urlsplit(url).netloc, self.min_request_gap)
+                async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=15)) as response:
+                    if response.status not in self.retry_statuses or attempt == self.max_retries:
+                        return response.status, await response.read(), response.headers
+                    retry_after = response.headers.get('Retry-After', '')
+            
+            # Wait outside the semaphore so other URLs keep going
+            delay = min(int(retry_after), self.max_retry_after) if retry_after.isdigit() else self.retry_backoff * 2 ** attempt
+            logger.info(f"🔁 HTTP {response.status}, retrying in {delay}s: {url}")
+            await asyncio.sleep(delay)
+    
+    async def check_single_date_availability(self, session, target_date, day_label):
+        """Check availability for a single date, fetching its URLs concurrently"""
         date_info = self.format_date_for_url(target_date)
         
         logger.info(f"\n📅 Checking {day_label.upper()}: {date_info['display_date']} ({date_info['day_name']})")
         logger.info("-" * 70)
         
-        urls_to_check = self.build_joffre_urls(target_date, day_label)
+        urls_to_check = self._urls_by_day.get(day_label)
+        if urls_to_check is None:
+            urls_to_check = self._urls_by_day[day_label] = self.build_joffre_urls(target_date, day_label)
         availability_found = False
         
-        for i, url in enumerate(urls_to_check, 1):
-            try:
-                logger.info(f"🔍 [{i}/{len(urls_to_check)}] {url}")
-                response = self.session.get(url, timeout=15)
+        # Validators are cached per date: the dates are checked independently, so a URL that
+        # showed nothing for one date says nothing about it for another
+        cache_keys = {url: f"{date_info['iso_date']} {url}" for url in urls_to_check}
+        tasks = {
+            asyncio.ensure_future(self._fetch(session, url, self.conditional_headers(cache_keys[url]))): (i, url)
+            for i, url in enumerate(urls_to_check, 1)
+        }
+        pending = set(tasks)
+        
+        try:
+            # Handle responses as they arrive and stop at the first positive
+            while pending and not availability_found:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
                 
-                if response.status_code == 200:
-                    logger.info(f"✅ Loaded ({len(response.text)} chars)")
-                    
-                    # Save debug content
-                    self.save_debug_content(response.text, f"{day_label}_check_{i}", url, target_date, day_label)
-                    
-                    if self.parse_for_joffre_availability(response.text, url, target_date, day_label):
-                        availability_found = True
-                        break
-                else:
-                    logger.warning(f"⚠️ HTTP {response.status_code}")
-                    
-            except Exception as e:
-                logger.warning(f"⚠️ Error: {e}")
-                continue
-            
-            time.sleep(1)  # Be respectful
+                for task in done:
+                    i, url = tasks[task]
+                    try:
+                        logger.info("🔍 [%d/%d] %s", i, len(urls_to_check), url)
+                        status, html_content, headers = task.result()
+                        cache_key = cache_keys[url]
+                        
+                        if status == 304:
+                            logger.info("♻️ Not modified since it showed no availability")
+                            self.remember_unavailable(cache_key, status, headers)
+                        elif status == 200:
+                            logger.info("✅ Loaded (%d bytes)", len(html_content))
+                            
+                            # Pages that never mention Joffre can't report its availability
+                            if not self._JOFFRE_BYTES_RE.search(html_content):
+                                logger.debug("   No Joffre content, skipping parse")
+                                self.remember_unavailable(cache_key, status, headers)
+                                continue
+                            
+                            # Parse once and share the tree between the debug dump and the parser;
+                            # reserve.bcparks.ca serves UTF-8, so skip encoding detection
+                            soup = BeautifulSoup(html_content, 'lxml', parse_only=STRAINER, from_encoding='utf-8')
+                            
+                            # Save debug content in a worker thread so the next fetch isn't held up
+                            if self.debug_dump:
+                                self._debug_writes.append(asyncio.create_task(asyncio.to_thread(
+                                    self.save_debug_content, soup, html_content, f"{day_label}_check_{i}", url, target_date, day_label
+                                )))
+                            
+                            if self.parse_for_joffre_availability(soup, url, target_date, day_label):
+                                availability_found = True
+                                break
+                            self.remember_unavailable(cache_key, status, headers)
+                        else:
+                            logger.warning(f"⚠️ HTTP {status}")
+                            
+                    except Exception as e:
+                        logger.warning(f"⚠️ Error: {e}")
+        finally:
+            for task in pending:
+                task.cancel()
         
         result_emoji = "✅" if availability_found else "❌"
         logger.info(f"{result_emoji} {day_label.capitalize()} result: {'AVAILABLE' if availability_found else 'NOT AVAILABLE'}")
         
         return availability_found
     
-    def check_all_dates_availability(self):
-        """Check availability for all three dates"""
+    async def check_all_dates_availability(self):
+        """Check availability for all three dates concurrently"""
         try:
             target_dates = self.get_target_dates()
-            results = {}
+            day_labels = {
+                'today': 'today',
+                'tomorrow': 'tomorrow', 
+                'day_after': 'day after tomorrow'
+            }
             
-            # Check each date
-            for day_key, date_obj in target_dates.items():
-                day_labels = {
-                    'today': 'today',
-                    'tomorrow': 'tomorrow', 
-                    'day_after': 'day after tomorrow'
-                }
-                
-                day_label = day_labels[day_key]
-                availability_found = self.check_single_date_availability(date_obj, day_label)
-                
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+            self._host_locks = {}
+            self._debug_writes = []
+            self._urls_by_day = {}
+            self._next_etag_cache = {}
+            connector = aiohttp.TCPConnector(limit=10, keepalive_timeout=60)
+            
+            async with aiohttp.ClientSession(connector=connector, headers=self._HEADERS) as session:
+                found = await asyncio.gather(*[
+                    self.check_single_date_availability(session, date_obj, day_labels[day_key])
+                    for day_key, date_obj in target_dates.items()
+                ])
+            
+            # Let pending debug dumps finish before the run moves on
+            if self._debug_writes:
+                await asyncio.gather(*self._debug_writes)
+            
+            results = {}
+            for (day_key, date_obj), availability_found in zip(target_dates.items(), found):
                 results[day_key] = {
                     'date': date_obj,
-                    'label': day_label,
+                    'label': day_labels[day_key],
                     'available': availability_found
                 }
-                
-                # Small delay between date checks
-                time.sleep(2)
             
             return results
             
@@ -204,8 +313,11 @@ class JoffreThreeDaysMonitor:
             logger.error(f"❌ Multi-date check failed: {e}")
             return {}
     
-    def save_debug_content(self, html_content, filename_prefix, source_url, target_date, day_label):
+    def save_debug_content(self, soup, html_content, filename_prefix, source_url, target_date, day_label):
         """Save debug content for analysis"""
+        if not self.debug_dump:
+            return
+        
         try:
             timestamp = int(time.time())
             date_str = target_date.strftime('%Y%m%d')
@@ -217,10 +329,9 @@ class JoffreThreeDaysMonitor:
                 f.write(f"<!-- Target Date: {target_date.strftime('%Y-%m-%d %A')} -->\n")
                 f.write(f"<!-- Source URL: {source_url} -->\n")
                 f.write(f"<!-- Generated: {datetime.now()} -->\n\n")
-                f.write(html_content)
+                f.write(html_content.decode('utf-8', errors='replace'))
             
             # Save text version
-            soup = BeautifulSoup(html_content, 'html.parser')
             text_content = soup.get_text()
             
             text_filename = f"debug_{filename_prefix}_{date_str}_{timestamp}.txt"
@@ -232,104 +343,77 @@ class JoffreThreeDaysMonitor:
                 f.write("=" * 80 + "\n\n")
                 f.write(text_content)
             
-            logger.debug(f"💾 Saved: {html_filename}, {text_filename}")
+            logger.debug("💾 Saved: %s, %s", html_filename, text_filename)
             
         except Exception as e:
             logger.error(f"❌ Failed to save debug content: {e}")
     
-    def parse_for_joffre_availability(self, html_content, source_url, target_date, day_label):
+    def parse_for_joffre_availability(self, soup, source_url, target_date, day_label):
         try:
-            now = datetime.now(self.timezone)
-            soup = BeautifulSoup(html_content, 'html.parser')
-            page_text = soup.get_text().lower()
+            page_text = soup.get_text()
             
             # Check for Joffre Lakes content
-            joffre_keywords = ['joffre', 'joffrey']
-            has_joffre_content = any(keyword in page_text for keyword in joffre_keywords)
+            has_joffre_content = self._JOFFRE_RE.search(page_text) is not None
             
-            # Check for the specific date
+            # Check for the specific date (only reported in debug output)
             date_info = self.format_date_for_url(target_date)
-            date_keywords = [
-                date_info['iso_date'],
-                target_date.strftime('%B %d').lower(),
-                target_date.strftime('%b %d').lower(),
-                target_date.strftime('%d %B').lower(),
-                target_date.strftime('%m/%d'),
-                target_date.strftime('%-d').lower()
-            ]
-            
-            has_target_date = any(date_keyword in page_text for date_keyword in date_keywords)
-            
-            logger.debug(f"   Joffre content: {has_joffre_content}, Target date: {has_target_date}")
+            if logger.isEnabledFor(logging.DEBUG):
+                has_target_date = _date_regex(target_date.date()).search(page_text) is not None
+                logger.debug("   Joffre content: %s, Target date: %s", has_joffre_content, has_target_date)
             
             if not has_joffre_content:
                 return False
             
-            # Enhanced availability indicators
-            availability_indicators = [
-                'available', 'book now', 'reserve now', 'select date', 
-                'choose date', 'select time', 'purchase', 'add to cart',
-                'book online', 'reservation available', 'make reservation',
-                'day use pass', 'day pass available', 'passes available',
-                'book this date', 'available for booking', 'reserve this date'
-            ]
-            
-            unavailable_indicators = [
-                'sold out', 'fully booked', 'no availability', 'unavailable',
-                'no passes available', 'booking closed', 'not available',
-                'waitlist only', 'no day use passes', 'passes sold out',
-                'date unavailable', 'not accepting reservations', 'fully reserved'
-            ]
-            
-            found_availability = [ind for ind in availability_indicators if ind in page_text]
-            found_unavailable = [ind for ind in unavailable_indicators if ind in page_text]
-            
-            # Look for interactive elements
-            booking_buttons = soup.find_all(['button', 'a'], string=lambda text: 
-                text and any(word in text.lower() for word in ['book', 'reserve', 'purchase', 'select', 'available']))
+            # Any unavailable wording settles it, so check that before anything else
+            unavailable = self._UNAVAIL_RE.search(page_text)
+            if unavailable:
+                logger.debug("❌ %s unavailable (%s)", day_label.capitalize(), unavailable.group().lower())
+                return False
             
-            date_inputs = soup.find_all(['input', 'select'], attrs={
-                'name': lambda x: x and any(word in x.lower() for word in ['date', 'arrival', 'visit'])
-            })
+            # One pass over the page, de-duplicated in page order
+            found_availability = list(dict.fromkeys(m.lower() for m in self._AVAIL_RE.findall(page_text)))
             
-            has_interactive_elements = len(booking_buttons) > 0 or len(date_inputs) > 0
+            # Look for interactive elements; one match of either kind is enough
+            has_interactive_elements = (
+                any(self._BTN_RE.search(e.get_text()) for e in soup.select('button, a'))
+                or any(self._INPUT_NAME_RE.search(e['name']) for e in soup.select('input[name], select[name]'))
+            )
             
-            logger.debug(f"   Availability terms: {found_availability}")
-            logger.debug(f"   Unavailable terms: {found_unavailable}")
-            logger.debug(f"   Interactive elements: {has_interactive_elements}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("   Availability terms: %s", found_availability)
+                logger.debug("   Interactive elements: %s", has_interactive_elements)
             
             # Decision logic
-            has_availability_text = len(found_availability) > 0
-            has_unavailable_text = len(found_unavailable) > 0
-            
-            if (has_availability_text or has_interactive_elements) and not has_unavailable_text:
+            if found_availability or has_interactive_elements:
                 logger.info(f"🎉 AVAILABILITY DETECTED FOR {day_label.upper()}!")
                 
-                message = f"🏔️ <b>JOFFRE LAKES AVAILABLE!</b> 🎉\n\n"
-                message += f"📅 <b>DATE:</b> {date_info['display_date']}\n"
-                message += f"🗓️ <b>Day:</b> {date_info['day_name']}\n"
-                message += f"⏰ <b>When:</b> {day_label.title()}\n\n"
-                message += f"🎫 <b>Status:</b> Availability detected\n"
-                message += f"🔗 <b>BOOK NOW:</b> {source_url}\n\n"
+                parts = [
+                    self._AVAIL_HEADER,
+                    f"📅 <b>DATE:</b> {date_info['display_date']}\n",
+                    f"🗓️ <b>Day:</b> {date_info['day_name']}\n",
+                    f"⏰ <b>When:</b> {day_label.title()}\n\n",
+                    "🎫 <b>Status:</b> Availability detected\n",
+                    f"🔗 <b>BOOK NOW:</b> {source_url}\n\n"
+                ]
                 
                 if found_availability:
-                    message += f"✅ <b>Indicators:</b> {', '.join(found_availability[:2])}\n"
+                    parts.append(f"✅ <b>Indicators:</b> {', '.join(found_availability[:2])}\n")
                 if has_interactive_elements:
-                    message += f"🔘 <b>Booking:</b> Interactive elements found\n"
+                    parts.append("🔘 <b>Booking:</b> Interactive elements found\n")
                 
-                message += f"\n⚡ <b>URGENT:</b> Joffre spots disappear in minutes!\n"
-                message += f"🏃‍♂️ <b>Book immediately!</b>\n\n"
-                message += f"🕐 <b>Found:</b> {now.strftime('%H:%M:%S')}"
+                parts.append(self._AVAIL_URGENT)
+                parts.append(f"🕐 <b>Found:</b> {self._run_now.strftime('%H:%M:%S')}")
+                message = "".join(parts)
                 
-                self.send_telegram(message)
+                if self.urgent_first_hit and self._urgent_task is None:
+                    # Post from a worker thread so the fetches still in flight aren't held up
+                    self._urgent_task = asyncio.create_task(asyncio.to_thread(self.send_or_queue_telegram, message))
+                else:
+                    self.queue_telegram(message)
                 return True
             
-            elif has_unavailable_text:
-                logger.debug(f"❌ {day_label.capitalize()} unavailable")
-                return False
-            
             else:
-                logger.debug(f"❓ {day_label.capitalize()} status unclear")
+                logger.debug("❓ %s status unclear", day_label.capitalize())
                 return False
                 
         except Exception as e:
@@ -338,7 +422,7 @@ class JoffreThreeDaysMonitor:
     
     def send_summary_notification(self, results):
         """Send a summary of all date checks"""
-        now = datetime.now(self.timezone)
+        now = self._run_now
         current_hour = now.hour
         
         # Send summary during daytime hours
@@ -346,35 +430,41 @@ class JoffreThreeDaysMonitor:
             available_dates = [info for info in results.values() if info['available']]
             
             if available_dates:
-                # At least one date available - already sent individual notifications
+                # At least one date available - its alerts are already queued
+                return
+            
+            # Only send summary every few hours to avoid spam
+            if current_hour not in [7, 12, 19]:
                 return
             
             # No availability found - send summary
-            message = f"📊 <b>Joffre Lakes Check Summary</b>\n\n"
+            parts = [self._SUMMARY_HEADER]
             
             for day_key in ['today', 'tomorrow', 'day_after']:
                 if day_key in results:
                     info = results[day_key]
                     date_str = self.format_date_for_url(info['date'])
                     status = "✅ AVAILABLE" if info['available'] else "❌ No availability"
-                    message += f"🔹 <b>{info['label'].title()}:</b> {date_str['display_date']} ({date_str['day_name']}) - {status}\n"
+                    parts.append(f"🔹 <b>{info['label'].title()}:</b> {date_str['display_date']} ({date_str['day_name']}) - {status}\n")
             
-            message += f"\n⏰ <b>Checked:</b> {now.strftime('%Y-%m-%d %H:%M:%S')}\n"
-            message += f"🔄 <b>Next check:</b> Next scheduled run\n\n"
-            message += f"📱 You'll get instant alerts when spots appear!"
+            parts.append(f"\n⏰ <b>Checked:</b> {now.strftime('%Y-%m-%d %H:%M:%S')}\n")
+            parts.append(self._SUMMARY_FOOTER)
             
-            # Only send summary every few hours to avoid spam
-            if current_hour in [7, 12, 19]:
-                self.send_telegram(message)
+            self.queue_telegram("".join(parts))
     
-    def run_comprehensive_check(self):
-        start_time = datetime.now(self.timezone)
+    async def run_comprehensive_check(self):
+        self.start_run_clock()
+        self._urgent_task = None
+        start_time = time.perf_counter()
         logger.info("=" * 80)
         logger.info("🚀 JOFFRE LAKES 3-DAY COMPREHENSIVE CHECK")
         logger.info("=" * 80)
         
+        # Test the Telegram connection in a worker thread while the dates are checked
+        startup_task = asyncio.create_task(asyncio.to_thread(self.test_telegram_connection))
+        
         try:
-            results = self.check_all_dates_availability()
+            results = await self.check_all_dates_availability()
             
             if results:
                 logger.info("\n📊 FINAL RESULTS:")
@@ -397,13 +487,13 @@ class JoffreThreeDaysMonitor:
             else:
                 logger.error("❌ No results obtained from date checks")
             
-            duration = (datetime.now(self.timezone) - start_time).total_seconds()
+            duration = time.perf_counter() - start_time
             logger.info(f"\n⏱️ Total check time: {duration:.2f} seconds")
             
         except Exception as e:
             logger.error(f"❌ Comprehensive check failed: {e}")
             
-            now = datetime.now(self.timezone)
+            now = self._run_now
             if 6 <= now.hour <= 23:
                 error_message = f"⚠️ <b>Monitor Error</b>\n\n"
                 error_message += f"❌ Failed during 3-day availability check\n"
@@ -411,7 +501,15 @@ class JoffreThreeDaysMonitor:
                 error_message += f"⏰ Time: {now.strftime('%Y-%m-%d %H:%M:%S')}\n"
                 error_message += f"🔄 Will retry on next scheduled run"
                 
-                self.send_telegram(error_message)
+                self.queue_telegram(error_message)
+        
+        # Startup message first, then availability alerts (and any error) in a single post.
+        # With JOFFRE_URGENT the first alert has already gone out ahead of it on its own
+        await startup_task
+        if self._urgent_task is not None:
+            await self._urgent_task
+        self.flush_telegram()
+        self.save_etag_cache()
         
         logger.info("=" * 80)
         logger.info("✅ 3-DAY CHECK COMPLETED")
@@ -421,7 +519,7 @@ def main():
     try:
         logger.info("🚀 Starting Joffre Lakes 3-Day Monitor...")
         checker = JoffreThreeDaysMonitor()
-        checker.run_comprehensive_check()
+        asyncio.run(checker.run_comprehensive_check())
         
     except Exception as e:
         error_msg = f"💥 Fatal error: {e}"
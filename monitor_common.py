@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Monitor Common - Telegram Delivery, Run Clock and Page Validators Shared by Both Monitors
+"""
+
+import requests
+import json
+import logging
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+import os
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Telegram rejects messages longer than this
+TELEGRAM_MAX_LENGTH = 4096
+
+class TelegramRetry(Retry):
+    """Retry for Telegram calls that never replays a sendMessage the server may have delivered"""
+    
+    # A flood-wait can ask for minutes; don't let it hold up the end-of-run flush
+    MAX_RETRY_AFTER = 30
+    
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, self.MAX_RETRY_AFTER)
+    
+    def is_retry(self, method, status_code, has_retry_after=False):
+        # A 429 is a refusal, but after a 5xx from a gateway the message may already be out
+        if method == 'POST' and status_code != 429:
+            return False
+        return super().is_retry(method, status_code, has_retry_after)
+
+class BaseMonitor:
+    """Telegram batching, the run clock and the ETag cache; subclasses do the checking"""
+    
+    # Where validators of pages that showed no availability are kept between runs
+    etag_cache_file = None
+    
+    def __init__(self):
+        self.bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
+        self.chat_id = os.getenv('TELEGRAM_CHAT_ID')
+        if not self.bot_token or not self.chat_id:
+            raise ValueError("Missing Telegram credentials")
+        
+        self.timezone = ZoneInfo('America/Vancouver')
+        self.start_run_clock()
+        
+        # Validators for pages last seen without availability; a 304 means nothing changed.
+        # Each monitor chooses its own keys (see remember_unavailable)
+        self._etag_cache = self.load_etag_cache()
+        self._next_etag_cache = {}
+        
+        # Raw pages are only written to disk when asked for
+        self.debug_dump = bool(os.getenv('DEBUG_DUMP'))
+        
+        # Telegram messages waiting for flush_telegram
+        self._pending_telegram = []
+        
+        # Telegram is a different host, so give it its own small keep-alive pool. Server
+        # errors are retried for getMe; sendMessage is only replayed after a rate limit
+        telegram_retry = TelegramRetry(
+            total=2,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({'GET', 'POST'}),
+            raise_on_status=False
+        )
+        self.telegram_session = requests.Session()
+        self.telegram_session.mount('https://api.telegram.org', HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=telegram_retry))
+        self._tg_send_url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
+    
+    def start_run_clock(self):
+        """Capture the current time once; everything in a run reports against it"""
+        self._run_now = datetime.now(self.timezone)
+        self._run_now_str = self._run_now.strftime('%Y-%m-%d %H:%M:%S')
+    
+    def get_target_dates(self):
+        """Get today, tomorrow, and day after tomorrow"""
+        now = self._run_now
+        dates = {
+            'today': now,
+            'tomorrow': now + timedelta(days=1),
+            'day_after': now + timedelta(days=2)
+        }
+        return dates
+    
+    def build_startup_message(self):
+        """The message announcing a run, sent once the bot is known to work"""
+        raise NotImplementedError
+    
+    def test_telegram_connection(self):
+        """Test if Telegram bot is working, and queue the startup message if it is"""
+        try:
+            url = f"https://api.telegram.org/bot{self.bot_token}/getMe"
+            response = self.telegram_session.get(url, timeout=10)
+            
+            if response.status_code == 200:
+                bot_info = response.json()
+                logger.info(f"✅ Telegram bot connected: {bot_info['result']['username']}")
+                
+                # Ahead of any alert queued while getMe was in flight
+                self._pending_telegram.insert(0, self.build_startup_message())
+            else:
+                logger.error(f"❌ Telegram bot test failed: {response.status_code}")
+                
+        except Exception as e:
+            logger.error(f"❌ Telegram connection test error: {e}")
+    
+    def send_telegram(self, message):
+        try:
+            payload = {
+                'chat_id': self.chat_id,
+                'text': message,
+                'parse_mode': 'HTML'
+            }
+            
+            # sendMessage takes plain form fields, so there's no JSON to serialize
+            response = self.telegram_session.post(self._tg_send_url, data=payload, timeout=10)
+            
+            if response.status_code == 200:
+                logger.info("✅ Telegram notification sent successfully")
+                return True
+            else:
+                logger.error(f"❌ Telegram API error: {response.status_code} - {response.text}")
+                return False
+                
+        except Exception as e:
+            logger.error(f"❌ Failed to send Telegram message: {e}")
+            return False
+    
+    def queue_telegram(self, message):
+        """Queue a message to be sent with the next flush_telegram"""
+        self._pending_telegram.append(message)
+    
+    def flush_telegram(self):
+        """Send queued messages, joined into as few Telegram posts as the length limit allows"""
+        separator = "\n\n───\n\n"
+        batch = ""
+        
+        for message in self._pending_telegram:
+            for part in self.split_for_telegram(message):
+                if batch and len(batch) + len(separator) + len(part) > TELEGRAM_MAX_LENGTH:
+                    self.send_telegram(batch)
+                    batch = ""
+                batch = f"{batch}{separator}{part}" if batch else part
+        
+        if batch:
+            self.send_telegram(batch)
+        
+        self._pending_telegram = []
+    
+    def split_for_telegram(self, message):
+        """Split a message on line boundaries into pieces Telegram will accept"""
+        if len(message) <= TELEGRAM_MAX_LENGTH:
+            return [message]
+        
+        parts = []
+        current = ""
+        for line in message.split('\n'):
+            line = line[:TELEGRAM_MAX_LENGTH]
+            if current and len(current) + 1 + len(line) > TELEGRAM_MAX_LENGTH:
+                parts.append(current)
+                current = line
+            else:
+                current = f"{current}\n{line}" if current else line
+        parts.append(current)
+        
+        return parts
+    
+    def load_etag_cache(self):
+        """Load the validators saved by the previous run"""
+        try:
+            with open(self.etag_cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def save_etag_cache(self):
+        """Save validators for pages seen without availability this run"""
+        try:
+            with open(self.etag_cache_file, 'w', encoding='utf-8') as f:
+                json.dump(self._next_etag_cache, f)
+        except OSError as e:
+            logger.error(f"❌ Failed to save ETag cache: {e}")
+    
+    def conditional_headers(self, key):
+        """Request headers asking whether the page saved under key has changed"""
+        headers = {}
+        validators = self._etag_cache.get(key)
+        if validators:
+            if 'etag' in validators:
+                headers['If-None-Match'] = validators['etag']
+            if 'last_modified' in validators:
+                headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+    
+    def remember_unavailable(self, key, status, headers):
+        """Keep a page's validators so the next run can ask whether it changed"""
+        if status == 304:
+            # Unchanged, so the validators it was requested with still apply
+            self._next_etag_cache[key] = self._etag_cache[key]
+            return
+        
+        validators = {}
+        if 'ETag' in headers:
+            validators['etag'] = headers['ETag']
+        if 'Last-Modified' in headers:
+            validators['last_modified'] = headers['Last-Modified']
+        if validators:
+            self._next_etag_cache[key] = validators